@@ -1,9 +1,9 @@
 import streamlit as st
 import sqlite3
 import pandas as pd
+import numpy as np
 import plotly.express as px
 from pathlib import Path
-from cryptography.fernet import Fernet
 import tempfile
 import os
 import itertools
@@ -12,14 +12,323 @@ import dns.resolver
 import smtplib
 import re
 from email_validator import validate_email, EmailNotValidError
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import time
 import requests
 from bs4 import BeautifulSoup
 from html import unescape
 from urllib.parse import urlparse
 from jina_research import JinaDeepResearch
-from lta_dashboard import LTADashboard
+from lta_dashboard import LTADashboard, csv_buffer
+from encrypt_db import decrypt_database_file
+
+# Columns of the profiles table shown in and exported from the dashboard
+PROFILE_COLS = [
+    'name', 'title', 'company', 'location', 'duration',
+    'connection_degree', 'mutual_connections', 'profile_url', 'about'
+]
+
+# Number of profiles sent to Jina DeepSearch in a single batch request
+JINA_BATCH_SIZE = 5
+
+# Shorter search terms match nearly every row, so they are not applied
+MIN_SEARCH_CHARS = 2
+
+# Rows of the profile table sent to the browser per page
+PROFILE_PAGE_SIZE = 100
+
+@st.cache_resource
+def get_jina_client():
+    """Return a Jina DeepResearch client shared across reruns and sessions."""
+    return JinaDeepResearch()
+
+
+@st.cache_resource
+def get_batch_executor():
+    """Return the thread pool that runs background batch searches."""
+    return ThreadPoolExecutor(max_workers=2)
+
+
+def jina_person_info(profile):
+    """Build the search_email person details for a batch profile."""
+    return {
+        'full_name': profile['name'],
+        'company': profile['company'],
+        'title': profile['title'],
+        'linkedin_url': profile['profile_url']
+    }
+
+
+def batch_search_result(profile, result):
+    """Add a DeepSearch result to a batch profile for display and export."""
+    return {
+        **profile,
+        'email': result['email'] if result['email'] else 'Not found',
+        'confidence': result['confidence'],
+        'source': result['source'] if result['source'] else 'N/A',
+        'thoughts': result['thoughts'] if result['thoughts'] else 'N/A'
+    }
+
+
+def batch_search_error(profile, error):
+    """Record a failed DeepSearch request against a batch profile."""
+    return {
+        **profile,
+        'email': 'Error',
+        'confidence': 'N/A',
+        'source': str(error),
+        'thoughts': 'N/A'
+    }
+
+
+def email_search_section(people_df):
+    """Search emails for several selected people of `people_df` concurrently."""
+    st.subheader("Email Search")
+    
+    # Label every row once; the widget then only looks labels up by index
+    display = (
+        people_df['name'].fillna('') + " - " +
+        people_df['title'].fillna('') + " at " +
+        people_df['company'].astype(object).fillna('')
+    ).to_dict()
+    selected_idx = st.multiselect(
+        "Select People",
+        options=list(display.keys()),
+        format_func=display.get,
+        key="email_search_people"
+    )
+    selected_people = people_df.loc[selected_idx].to_dict('records')
+    
+    if st.button(f"Search Email for {len(selected_people)} Selected", key="email_search_button",
+                 disabled=not selected_people):
+        jina_client = get_jina_client()
+        
+        # One placeholder per person, filled in as each search completes
+        placeholders = [st.empty() for _ in selected_people]
+        for placeholder, person in zip(placeholders, selected_people):
+            placeholder.info(f"Searching for {person['name']}...")
+        
+        # Searches are network-bound, so they can run side by side on the shared session.
+        # Shut down without waiting, so a rerun does not block on searches still in flight
+        executor = ThreadPoolExecutor(max_workers=8)
+        try:
+            futures = {
+                executor.submit(jina_client.search_email, jina_person_info(person)): idx
+                for idx, person in enumerate(selected_people)
+            }
+            
+            for future in as_completed(futures):
+                idx = futures[future]
+                with placeholders[idx].container():
+                    st.markdown(f"**{selected_people[idx]['name']}**")
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        st.error(f"Error during search: {str(e)}")
+                        continue
+                    
+                    if result['email']:
+                        st.success(f"Found email: {result['email']}")
+                        st.info(f"Confidence: {result['confidence']}")
+                        if result['source']:
+                            st.info(f"Source: {result['source']}")
+                    else:
+                        st.warning("No email found")
+                    
+                    with st.expander("Raw Response"):
+                        st.text(result['raw_response'])
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def isin_sorted(values, sorted_ids):
+    """Vectorised membership test of `values` against a sorted array of unique ids."""
+    if not (np.issubdtype(values.dtype, np.number) and np.issubdtype(sorted_ids.dtype, np.number)):
+        return pd.Series(values).isin(sorted_ids).to_numpy()
+    if len(sorted_ids) == 0:
+        return np.zeros(len(values), dtype=bool)
+    
+    positions = np.clip(np.searchsorted(sorted_ids, values), 0, len(sorted_ids) - 1)
+    return sorted_ids[positions] == values
+
+
+@st.cache_resource(show_spinner=False)
+def load_lta_data(db_path, db_mtime):
+    """Load the LTA tables once per database version.
+
+    `db_mtime` is only part of the cache key, so replacing the database file
+    invalidates the cached frames. The returned frames are shared across
+    reruns and must not be modified in place. Only the columns the LTA tab
+    uses are selected.
+    """
+    lta_dashboard = LTADashboard(db_path)
+    conn = lta_dashboard.get_connection()
+    try:
+        lta_dashboard.create_indexes(conn)
+        
+        # Load clubs data
+        lta_dashboard.clubs_df = pd.read_sql_query("""
+            SELECT club_name, location FROM clubs
+        """, conn)
+
+        # Load teams data
+        lta_dashboard.teams_df = pd.read_sql_query("""
+            SELECT team_id, team_name, school_name, gender, draw_name, url
+            FROM teams
+        """, conn)
+
+        # Load contacts data with team and club information - fixed query
+        lta_dashboard.contacts_df = pd.read_sql_query("""
+            SELECT 
+                c.contact_id, c.name, c.phone, c.email,
+                tc.role, tc.team_id,
+                t.team_name, t.school_name, t.gender,
+                cl.club_name, cl.location
+            FROM contacts c
+            JOIN team_contacts tc ON c.contact_id = tc.contact_id
+            JOIN teams t ON tc.team_id = t.team_id AND tc.tournament_id = t.tournament_id
+            LEFT JOIN clubs cl ON t.club_id = cl.club_id AND t.tournament_id = cl.tournament_id
+        """, conn)
+
+        # Debug query to check raw team data
+        lta_dashboard.raw_teams_df = pd.read_sql_query("""
+            SELECT * FROM teams LIMIT 10
+        """, conn)
+
+        # Fix team_name if it's None or NaN
+        def fix_team_name(row):
+            if pd.isna(row['team_name']) or row['team_name'] is None:
+                # Try to construct a team name from school_name and gender
+                school = row['school_name'] if pd.notna(row['school_name']) else ''
+                gender = row['gender'] if pd.notna(row['gender']) else ''
+                if school and gender:
+                    return f"{school} {gender}"
+                elif school:
+                    return school
+                else:
+                    return "Unknown Team"
+            return row['team_name']
+
+        # Apply the fix to the contacts dataframe
+        lta_dashboard.contacts_df['team_name'] = lta_dashboard.contacts_df.apply(fix_team_name, axis=1)
+
+        # Load matches data
+        lta_dashboard.matches_df = pd.read_sql_query("""
+            SELECT
+                home_team_id, away_team_id,
+                match_date, match_time, home_team_name, away_team_name,
+                score, status, url
+            FROM matches
+        """, conn)
+
+        # Get unique values for filters
+        lta_dashboard.club_names = sorted(lta_dashboard.clubs_df['club_name'].dropna().unique())
+        lta_dashboard.school_names = sorted(lta_dashboard.teams_df['school_name'].dropna().unique())
+        lta_dashboard.locations = sorted(pd.concat([
+            lta_dashboard.clubs_df['location'].dropna(),
+            lta_dashboard.contacts_df['location'].dropna()
+        ]).unique())
+        lta_dashboard.roles = sorted(lta_dashboard.contacts_df['role'].dropna().unique())
+        lta_dashboard.genders = sorted(lta_dashboard.teams_df['gender'].dropna().unique())
+
+        # Store the filter columns as categoricals over the sidebar options, so
+        # isin() on a selection compares integer codes instead of strings
+        filter_categories = {
+            'school_name': lta_dashboard.school_names,
+            'club_name': lta_dashboard.club_names,
+            'location': lta_dashboard.locations,
+            'role': lta_dashboard.roles,
+            'gender': lta_dashboard.genders
+        }
+        for col, categories in filter_categories.items():
+            lta_dashboard.contacts_df[col] = pd.Categorical(
+                lta_dashboard.contacts_df[col], categories=categories
+            )
+        
+        # Lower-cased copies of the free-text columns for the contact search
+        for col in ['name', 'email', 'team_name']:
+            lta_dashboard.contacts_df[f'_{col}_lc'] = lta_dashboard.contacts_df[col].str.lower()
+    finally:
+        conn.close()
+        lta_dashboard.cleanup()
+    
+    return lta_dashboard
+
+
+@st.cache_resource(show_spinner=False)
+def load_profiles(encrypted_db_path, db_mtime):
+    """Decrypt and load the profiles once per database version.
+
+    Returns the profile frame, with its search blobs, and the school, title
+    and location filter options. `db_mtime` is only part of the cache key.
+    The frame is shared across reruns and must not be modified in place.
+    """
+    dashboard = LinkedInDashboard(encrypted_db_path)
+    try:
+        dashboard.load_data()
+    finally:
+        dashboard.cleanup()
+    return dashboard.df, dashboard.schools, dashboard.titles, dashboard.locations
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def lta_value_counts(_contacts_df, filter_key, column, top_n=None):
+    """Count contacts per value of `column`, most frequent first.
+
+    `_contacts_df` is not hashed by Streamlit; `filter_key` must uniquely
+    identify the filtered frame passed in.
+    """
+    counts = _contacts_df.groupby(column, sort=False, observed=True).size()
+    counts = counts.sort_values(ascending=False, kind='stable')
+    if top_n is not None:
+        counts = counts.head(top_n)
+    return counts.reset_index(name='count')
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def lta_contact_search_mask(_contacts_df, filter_key, search_term):
+    """Mark contacts whose name, email, school, club or team contains `search_term`.
+
+    Matching is literal and case-insensitive. `_contacts_df` is not hashed by
+    Streamlit; `filter_key` must uniquely identify the frame passed in.
+    """
+    term = search_term.lower()
+    masks = [
+        _contacts_df[col].str.contains(term, regex=False, na=False).to_numpy()
+        for col in ['_name_lc', '_email_lc', '_team_name_lc']
+    ]
+    
+    # Categorical columns: search each category once, then map back through the codes
+    for col in ['school_name', 'club_name']:
+        values = _contacts_df[col]
+        matches = values.cat.categories.str.lower().str.contains(term, regex=False)
+        # Code -1 (missing value) picks the appended False
+        masks.append(np.append(matches, False)[values.cat.codes.to_numpy()])
+    return np.logical_or.reduce(masks)
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def lta_csv_bytes(_df, filter_key):
+    """Serialize an LTA table to CSV once per `filter_key`.
+
+    `_df` is not hashed by Streamlit; `filter_key` must uniquely identify
+    the frame passed in.
+    """
+    return csv_buffer(_df).getvalue()
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def profile_search_mask(_profiles_df, filter_key, search_term, blob='_search_blob'):
+    """Mark profiles whose `blob` search text contains `search_term`.
+
+    `_search_blob` covers name, title, company and about; `_person_blob`
+    covers name, title and company. `_profiles_df` is not hashed by
+    Streamlit; `filter_key` must uniquely identify the frame passed in.
+    """
+    return _profiles_df[blob].str.contains(
+        search_term.lower(), regex=False, na=False
+    ).to_numpy(dtype=bool)
+
 
 class LinkedInDashboard:
     def __init__(self, encrypted_db_path="linkedin_data.encrypted.db"):
@@ -35,22 +344,11 @@ class LinkedInDashboard:
                 raise Exception("Database key not found in secrets")
             
             key = st.secrets['db_key'].encode()
-            fernet = Fernet(key)
             
-            # Read encrypted database
-            with open(self.encrypted_db_path, 'rb') as file:
-                encrypted_data = file.read()
-            
-            # Decrypt data
-            decrypted_data = fernet.decrypt(encrypted_data)
-            
-            # Create temporary file
-            temp_file = tempfile.NamedTemporaryFile(delete=False)
-            self.temp_db_path = temp_file.name
-            
-            # Write decrypted data to temporary file
-            with open(self.temp_db_path, 'wb') as file:
-                file.write(decrypted_data)
+            # Decrypt database chunk by chunk into a temporary file
+            with tempfile.NamedTemporaryFile(delete=False) as temp_file:
+                self.temp_db_path = temp_file.name
+                decrypt_database_file(key, self.encrypted_db_path, temp_file)
                 
         except Exception as e:
             st.error(f"Error decrypting database: {str(e)}")
@@ -80,11 +378,14 @@ class LinkedInDashboard:
             """)
             linkedin_table_exists = cursor.fetchone() is not None
             
+            # Only load the profile columns the dashboard uses
+            profile_cols = ", ".join(f"p.{col}" for col in PROFILE_COLS)
+            
             if linkedin_table_exists:
                 # Use the original query with linkedin_data
-                query = """
+                query = f"""
                     SELECT 
-                        p.*,
+                        {profile_cols},
                         s.name as school_name,
                         ld.base_url as domain_name
                     FROM profiles p
@@ -93,9 +394,9 @@ class LinkedInDashboard:
                 """
             else:
                 # Fallback query without linkedin_data
-                query = """
+                query = f"""
                     SELECT 
-                        p.*,
+                        {profile_cols},
                         s.name as school_name,
                         NULL as domain_name
                     FROM profiles p
@@ -104,6 +405,25 @@ class LinkedInDashboard:
             
             self.df = pd.read_sql_query(query, conn)
             
+            # Lower-cased search text, joined with a separator that will not appear
+            # in a search term: name, title and company for the DeepSearch profile
+            # pickers, plus about for the profile data search
+            self.df['_person_blob'] = self.df['name'].fillna('').str.cat(
+                [self.df[col].fillna('') for col in ['title', 'company']],
+                sep=' \u241f '
+            ).str.lower()
+            self.df['_search_blob'] = self.df['_person_blob'].str.cat(
+                self.df['about'].fillna('').str.lower(),
+                sep=' \u241f '
+            )
+            # Arrow-backed strings let str.contains run in pyarrow.compute
+            for col in ['_person_blob', '_search_blob']:
+                self.df[col] = self.df[col].astype('string[pyarrow]')
+            
+            # Repeated low-cardinality values are stored once per category
+            for col in ['company', 'school_name', 'domain_name', 'connection_degree']:
+                self.df[col] = self.df[col].astype('category')
+            
             # Get unique values for filters
             self.schools = sorted(self.df['company'].unique())
             self.titles = sorted(self.df['title'].dropna().unique())
@@ -528,7 +848,10 @@ class LinkedInDashboard:
         st.markdown("Filter and analyze LinkedIn profiles from various schools")
         
         try:
-            self.load_data()
+            db_mtime = os.path.getmtime(self.encrypted_db_path)
+            self.df, self.schools, self.titles, self.locations = load_profiles(
+                self.encrypted_db_path, db_mtime
+            )
             
             # Sidebar filters
             st.sidebar.header("Filters")
@@ -580,6 +903,13 @@ class LinkedInDashboard:
             if selected_degrees:
                 filtered_df = filtered_df[filtered_df['connection_degree'].isin(selected_degrees)]
             
+            # Identifies filtered_df for the cached profile search
+            profile_filter_key = (
+                db_mtime,
+                tuple(selected_schools), tuple(selected_titles),
+                tuple(selected_locations), tuple(selected_degrees)
+            )
+            
             # Display metrics
             col1, col2, col3, col4 = st.columns(4)
             with col1:
@@ -604,7 +934,7 @@ class LinkedInDashboard:
             
             with tab1:
                 # School distribution
-                school_counts = filtered_df['company'].value_counts().reset_index()
+                school_counts = filtered_df['company'].cat.remove_unused_categories().value_counts().reset_index()
                 school_counts.columns = ['school', 'count']  # Rename columns
                 fig1 = px.bar(
                     school_counts,
@@ -646,10 +976,8 @@ class LinkedInDashboard:
                 # Add search functionality for this tab
                 search_term = st.text_input("Search profiles (name, title, company)", key="deep_search_filter")
                 if search_term:
-                    search_mask = (
-                        filtered_df['name'].str.contains(search_term, case=False, na=False) |
-                        filtered_df['title'].str.contains(search_term, case=False, na=False) |
-                        filtered_df['company'].str.contains(search_term, case=False, na=False)
+                    search_mask = profile_search_mask(
+                        filtered_df, profile_filter_key, search_term, blob='_person_blob'
                     )
                     search_df = filtered_df[search_mask]
                 else:
@@ -683,7 +1011,7 @@ class LinkedInDashboard:
                     if st.button("Search with DeepResearch", key="deep_search_button"):
                         with st.spinner("Searching with Jina DeepResearch..."):
                             try:
-                                jina_client = JinaDeepResearch()
+                                jina_client = get_jina_client()
                                 result = jina_client.search_email({
                                     'full_name': selected_row['name'],
                                     'company': selected_row['company'],
@@ -723,6 +1051,11 @@ class LinkedInDashboard:
                             except Exception as e:
                                 st.error(f"Error during search: {str(e)}")
                                 st.error("Please check your Jina API key and try again.")
+                
+                # Several profiles at once, searched concurrently. The section labels
+                # every search result, so it is only built when switched on
+                if st.checkbox("Search several profiles at once", value=False, key="email_search_toggle"):
+                    email_search_section(search_df)
             with tab5:
                 st.subheader("Batch Jina DeepSearch")
                 
@@ -735,10 +1068,8 @@ class LinkedInDashboard:
                 # Search and select profiles
                 search_term = st.text_input("Search profiles (name, title, company)", key="batch_search_filter")
                 if search_term:
-                    search_mask = (
-                        filtered_df['name'].str.contains(search_term, case=False, na=False) |
-                        filtered_df['title'].str.contains(search_term, case=False, na=False) |
-                        filtered_df['company'].str.contains(search_term, case=False, na=False)
+                    search_mask = profile_search_mask(
+                        filtered_df, profile_filter_key, search_term, blob='_person_blob'
                     )
                     search_df = filtered_df[search_mask]
                 else:
@@ -787,59 +1118,100 @@ class LinkedInDashboard:
                     if st.button("Clear Batch", key="clear_batch"):
                         st.session_state.selected_profiles = []
                         st.session_state.search_results = []
+                        st.session_state.batch_jobs = []
                         st.success("Batch cleared")
 
+                    use_batch_mode = st.checkbox(
+                        "Use batch mode (runs in the background, check back for results)",
+                        key="batch_mode"
+                    )
+
                     # Search batch button
                     if st.button("Search Batch with DeepResearch", key="search_batch"):
                         st.session_state.search_results = []  # Clear previous results
                         
-                        progress_bar = st.progress(0)
-                        for idx, profile in enumerate(st.session_state.selected_profiles):
-                            with st.spinner(f"Searching {profile['name']}..."):
+                        # Several profiles share one request to stay under the API rate limit
+                        profiles = st.session_state.selected_profiles
+                        
+                        if use_batch_mode:
+                            # Submit every request now and collect the results on a later rerun
+                            chunks = [
+                                profiles[start:start + JINA_BATCH_SIZE]
+                                for start in range(0, len(profiles), JINA_BATCH_SIZE)
+                            ]
+                            jina_client = get_jina_client()
+                            executor = get_batch_executor()
+                            st.session_state.batch_jobs = [
+                                (chunk, executor.submit(
+                                    jina_client.search_email_batch,
+                                    [jina_person_info(profile) for profile in chunk]
+                                ))
+                                for chunk in chunks
+                            ]
+                            st.info(f"Submitted {len(profiles)} profiles in {len(chunks)} requests")
+                        else:
+                            # Requests run concurrently; progress advances as each one completes
+                            progress_bar = st.progress(0)
+                            search_results = [None] * len(profiles)
+                            searched = 0
+                            with st.spinner(f"Searching {len(profiles)} profiles..."):
                                 try:
-                                    jina_client = JinaDeepResearch()
-                                    result = jina_client.search_email({
-                                        'full_name': profile['name'],
-                                        'company': profile['company'],
-                                        'title': profile['title'],
-                                        'linkedin_url': profile['profile_url']
-                                    })
-                                    
-                                    # Add search result to profile info
-                                    search_result = {
-                                        **profile,
-                                        'email': result['email'] if result['email'] else 'Not found',
-                                        'confidence': result['confidence'],
-                                        'source': result['source'] if result['source'] else 'N/A',
-                                        'thoughts': result['thoughts'] if result['thoughts'] else 'N/A'
-                                    }
-                                    st.session_state.search_results.append(search_result)
-                                    
-                                except Exception as e:
-                                    st.error(f"Error searching {profile['name']}: {str(e)}")
-                                    search_result = {
-                                        **profile,
-                                        'email': 'Error',
-                                        'confidence': 'N/A',
-                                        'source': str(e),
-                                        'thoughts': 'N/A'
-                                    }
-                                    st.session_state.search_results.append(search_result)
+                                    jina_client = get_jina_client()
+                                    searches = jina_client.search_email_many(
+                                        [jina_person_info(profile) for profile in profiles],
+                                        batch_size=JINA_BATCH_SIZE
+                                    )
+                                    for indices, future in searches:
+                                        try:
+                                            for idx, result in zip(indices, future.result()):
+                                                search_results[idx] = batch_search_result(profiles[idx], result)
+                                        except Exception as e:
+                                            chunk_names = ", ".join(str(profiles[idx].get('name') or '?') for idx in indices)
+                                            st.error(f"Error searching {chunk_names}: {str(e)}")
+                                            for idx in indices:
+                                                search_results[idx] = batch_search_error(profiles[idx], e)
+                                        
+                                        # Update progress
+                                        searched += len(indices)
+                                        progress_bar.progress(searched / len(profiles))
                                 
-                                # Update progress
-                                progress_bar.progress((idx + 1) / len(st.session_state.selected_profiles))
-                        
+                                except Exception as e:
+                                    st.error(f"Error starting batch search: {str(e)}")
+                                    search_results = [batch_search_error(profile, e) for profile in profiles]
+                            
+                            st.session_state.search_results = search_results
+                            st.success("Batch search completed!")
+
+                # Collect results of a background batch once every request has finished
+                if st.session_state.get('batch_jobs'):
+                    jobs = st.session_state.batch_jobs
+                    finished = sum(future.done() for _, future in jobs)
+                    if finished < len(jobs):
+                        st.info(f"Batch search running: {finished} of {len(jobs)} requests finished")
+                        st.button("Refresh batch status", key="refresh_batch")
+                    else:
+                        st.session_state.search_results = []
+                        for chunk, future in jobs:
+                            try:
+                                for profile, result in zip(chunk, future.result()):
+                                    st.session_state.search_results.append(
+                                        batch_search_result(profile, result)
+                                    )
+                            except Exception as e:
+                                st.error(f"Error searching {', '.join(str(p.get('name') or '?') for p in chunk)}: {str(e)}")
+                                for profile in chunk:
+                                    st.session_state.search_results.append(
+                                        batch_search_error(profile, e)
+                                    )
+                        st.session_state.batch_jobs = []
                         st.success("Batch search completed!")
 
                 # Display and export results
                 if st.session_state.search_results:
                     st.write("### Search Results")
                     
-                    # Create DataFrame from results
-                    results_df = pd.DataFrame(st.session_state.search_results)
-                    
                     # Display results with thoughts in expandable sections
-                    for idx, row in results_df.iterrows():
+                    for row in st.session_state.search_results:
                         with st.expander(f"{row['name']} - {row['email']}"):
                             st.write(f"**Confidence:** {row['confidence']}")
                             st.write(f"**Source:** {row['source']}")
@@ -848,7 +1220,8 @@ class LinkedInDashboard:
                                 st.write(row['thoughts'])
                     
                     # Export to CSV with thoughts included
-                    csv = results_df.to_csv(index=False)
+                    results_df = pd.DataFrame(st.session_state.search_results)
+                    csv = csv_buffer(results_df)
                     st.download_button(
                         label="Download Results CSV",
                         data=csv,
@@ -871,71 +1244,8 @@ class LinkedInDashboard:
                     st.error(f"Database file {lta_dashboard.db_path} not found. Please run the lta_db_loader.py script first.")
                 else:
                     try:
-                        # Load LTA data with a custom query to fix the team name issue
-                        conn = lta_dashboard.get_connection()
-                        try:
-                            # Load clubs data
-                            lta_dashboard.clubs_df = pd.read_sql_query("""
-                                SELECT * FROM clubs
-                            """, conn)
-                            
-                            # Load teams data
-                            lta_dashboard.teams_df = pd.read_sql_query("""
-                                SELECT * FROM teams
-                            """, conn)
-                            
-                            # Load contacts data with team and club information - fixed query
-                            lta_dashboard.contacts_df = pd.read_sql_query("""
-                                SELECT 
-                                    c.contact_id, c.name, c.phone, c.email,
-                                    tc.role, tc.team_id, tc.tournament_id,
-                                    t.team_name, t.school_name, t.gender,
-                                    cl.club_name, cl.location
-                                FROM contacts c
-                                JOIN team_contacts tc ON c.contact_id = tc.contact_id
-                                JOIN teams t ON tc.team_id = t.team_id AND tc.tournament_id = t.tournament_id
-                                LEFT JOIN clubs cl ON t.club_id = cl.club_id AND t.tournament_id = cl.tournament_id
-                            """, conn)
-                            
-                            # Debug query to check raw team data
-                            raw_teams_df = pd.read_sql_query("""
-                                SELECT * FROM teams LIMIT 10
-                            """, conn)
-                            
-                            # Fix team_name if it's None or NaN
-                            def fix_team_name(row):
-                                if pd.isna(row['team_name']) or row['team_name'] is None:
-                                    # Try to construct a team name from school_name and gender
-                                    school = row['school_name'] if pd.notna(row['school_name']) else ''
-                                    gender = row['gender'] if pd.notna(row['gender']) else ''
-                                    if school and gender:
-                                        return f"{school} {gender}"
-                                    elif school:
-                                        return school
-                                    else:
-                                        return "Unknown Team"
-                                return row['team_name']
-                            
-                            # Apply the fix to the contacts dataframe
-                            lta_dashboard.contacts_df['team_name'] = lta_dashboard.contacts_df.apply(fix_team_name, axis=1)
-                            
-                            # Load matches data
-                            lta_dashboard.matches_df = pd.read_sql_query("""
-                                SELECT * FROM matches
-                            """, conn)
-                            
-                            # Get unique values for filters
-                            lta_dashboard.club_names = sorted(lta_dashboard.clubs_df['club_name'].dropna().unique())
-                            lta_dashboard.school_names = sorted(lta_dashboard.teams_df['school_name'].dropna().unique())
-                            lta_dashboard.locations = sorted(pd.concat([
-                                lta_dashboard.clubs_df['location'].dropna(),
-                                lta_dashboard.contacts_df['location'].dropna()
-                            ]).unique())
-                            lta_dashboard.roles = sorted(lta_dashboard.contacts_df['role'].dropna().unique())
-                            lta_dashboard.genders = sorted(lta_dashboard.teams_df['gender'].dropna().unique())
-                            
-                        finally:
-                            conn.close()
+                        lta_db_mtime = os.path.getmtime(lta_dashboard.db_path)
+                        lta_dashboard = load_lta_data(lta_dashboard.db_path, lta_db_mtime)
                         
                         # Sidebar filters for LTA data
                         st.sidebar.markdown("---")
@@ -948,61 +1258,77 @@ class LinkedInDashboard:
                             key="lta_filter_type"
                         )
                         
-                        if filter_type == "School":
-                            selected_schools = st.sidebar.multiselect(
-                                "Select LTA Schools",
-                                lta_dashboard.school_names,
+                        # The remaining filters only rerun the page when applied together
+                        with st.sidebar.form("lta_filters"):
+                            selected_schools = []
+                            selected_clubs = []
+                            if filter_type == "School":
+                                selected_schools = st.multiselect(
+                                    "Select LTA Schools",
+                                    lta_dashboard.school_names,
+                                    default=[],
+                                    key="lta_schools"
+                                )
+                            elif filter_type == "Club":
+                                selected_clubs = st.multiselect(
+                                    "Select LTA Clubs",
+                                    lta_dashboard.club_names,
+                                    default=[],
+                                    key="lta_clubs"
+                                )
+                            
+                            # Location filter
+                            selected_locations = st.multiselect(
+                                "Select LTA Locations",
+                                lta_dashboard.locations,
                                 default=[],
-                                key="lta_schools"
+                                key="lta_locations"
                             )
-                        elif filter_type == "Club":
-                            selected_clubs = st.sidebar.multiselect(
-                                "Select LTA Clubs",
-                                lta_dashboard.club_names,
+                            
+                            # Role filter
+                            selected_roles = st.multiselect(
+                                "Select LTA Roles",
+                                lta_dashboard.roles,
                                 default=[],
-                                key="lta_clubs"
+                                key="lta_roles"
                             )
+                            
+                            # Gender filter
+                            selected_genders = st.multiselect(
+                                "Select LTA Team Gender",
+                                lta_dashboard.genders,
+                                default=[],
+                                key="lta_genders"
+                            )
+                            
+                            st.form_submit_button("Apply LTA Filters")
                         
-                        # Location filter
-                        selected_locations = st.sidebar.multiselect(
-                            "Select LTA Locations",
-                            lta_dashboard.locations,
-                            default=[],
-                            key="lta_locations"
-                        )
-                        
-                        # Role filter
-                        selected_roles = st.sidebar.multiselect(
-                            "Select LTA Roles",
-                            lta_dashboard.roles,
-                            default=[],
-                            key="lta_roles"
-                        )
-                        
-                        # Gender filter
-                        selected_genders = st.sidebar.multiselect(
-                            "Select LTA Team Gender",
-                            lta_dashboard.genders,
-                            default=[],
-                            key="lta_genders"
-                        )
-                        
-                        # Apply filters to contacts dataframe
-                        filtered_contacts = lta_dashboard.contacts_df.copy()
+                        # Apply filters to contacts dataframe as one combined mask
+                        contacts_df = lta_dashboard.contacts_df
+                        mask = np.ones(len(contacts_df), dtype=bool)
                         
                         if filter_type == "School" and selected_schools:
-                            filtered_contacts = filtered_contacts[filtered_contacts['school_name'].isin(selected_schools)]
+                            mask &= contacts_df['school_name'].isin(selected_schools).to_numpy()
                         elif filter_type == "Club" and selected_clubs:
-                            filtered_contacts = filtered_contacts[filtered_contacts['club_name'].isin(selected_clubs)]
+                            mask &= contacts_df['club_name'].isin(selected_clubs).to_numpy()
                         
                         if selected_locations:
-                            filtered_contacts = filtered_contacts[filtered_contacts['location'].isin(selected_locations)]
+                            mask &= contacts_df['location'].isin(selected_locations).to_numpy()
                         
                         if selected_roles:
-                            filtered_contacts = filtered_contacts[filtered_contacts['role'].isin(selected_roles)]
+                            mask &= contacts_df['role'].isin(selected_roles).to_numpy()
                         
                         if selected_genders:
-                            filtered_contacts = filtered_contacts[filtered_contacts['gender'].isin(selected_genders)]
+                            mask &= contacts_df['gender'].isin(selected_genders).to_numpy()
+                        
+                        filtered_contacts = contacts_df[mask]
+                        
+                        # Identifies filtered_contacts for the cached aggregations below
+                        lta_filter_key = (
+                            lta_db_mtime, filter_type,
+                            tuple(selected_schools), tuple(selected_clubs),
+                            tuple(selected_locations), tuple(selected_roles), tuple(selected_genders)
+                        )
                         
                         # Display metrics
                         col1, col2, col3, col4 = st.columns(4)
@@ -1027,52 +1353,53 @@ class LinkedInDashboard:
                         with lta_tab1:
                             st.subheader("Contact List")
                             
-                            # Debug information to help identify issues
-                            with st.expander("Debug Information"):
-                                st.write("### Data Sample")
-                                st.write("This shows a sample of the raw data to help identify any issues:")
-                                st.dataframe(
-                                    filtered_contacts.head(5),
-                                    use_container_width=True
-                                )
+                            # Debug information to help identify issues, only built when requested
+                            if st.checkbox("Show debug info", value=False, key="lta_debug"):
+                                with st.expander("Debug Information"):
+                                    st.write("### Data Sample")
+                                    st.write("This shows a sample of the raw data to help identify any issues:")
+                                    st.dataframe(
+                                        filtered_contacts.head(5),
+                                        use_container_width=True
+                                    )
                                 
-                                # Show raw team data
-                                st.write("### Raw Team Data")
-                                st.write("This shows the raw data from the teams table:")
-                                st.dataframe(
-                                    raw_teams_df,
-                                    use_container_width=True
-                                )
+                                    # Show raw team data
+                                    st.write("### Raw Team Data")
+                                    st.write("This shows the raw data from the teams table:")
+                                    st.dataframe(
+                                        lta_dashboard.raw_teams_df,
+                                        use_container_width=True
+                                    )
                                 
-                                # Show column names and types - Fixed to prevent type conversion errors
-                                st.write("### Column Information")
-                                col_info = pd.DataFrame({
-                                    'Column': filtered_contacts.columns,
-                                    'Type': [str(dtype) for dtype in filtered_contacts.dtypes]
-                                })
+                                    # Show column names and types - Fixed to prevent type conversion errors
+                                    st.write("### Column Information")
+                                    col_info = pd.DataFrame({
+                                        'Column': filtered_contacts.columns,
+                                        'Type': [str(dtype) for dtype in filtered_contacts.dtypes]
+                                    })
                                 
-                                # Add sample values safely
-                                sample_values = []
-                                for col in filtered_contacts.columns:
-                                    try:
-                                        values = filtered_contacts[col].dropna().head(3).tolist()
-                                        sample_values.append(str(values) if values else "[]")
-                                    except Exception as e:
-                                        sample_values.append(f"Error: {str(e)}")
+                                    # Add sample values safely
+                                    sample_values = []
+                                    for col in filtered_contacts.columns:
+                                        try:
+                                            values = filtered_contacts[col].dropna().head(3).tolist()
+                                            sample_values.append(str(values) if values else "[]")
+                                        except Exception as e:
+                                            sample_values.append(f"Error: {str(e)}")
                                 
-                                col_info['Sample Values'] = sample_values
-                                st.dataframe(col_info, use_container_width=True)
+                                    col_info['Sample Values'] = sample_values
+                                    st.dataframe(col_info, use_container_width=True)
                             
                             # Search functionality
-                            search_term = st.text_input("Search contacts (name, email, school, club)", key="lta_contact_search")
+                            search_term = st.text_input(
+                                "Search contacts (name, email, school, club)",
+                                key="lta_contact_search",
+                                help=f"Type at least {MIN_SEARCH_CHARS} characters"
+                            )
+                            if len(search_term) < MIN_SEARCH_CHARS:
+                                search_term = ""
                             if search_term:
-                                search_mask = (
-                                    filtered_contacts['name'].str.contains(search_term, case=False, na=False) |
-                                    filtered_contacts['email'].str.contains(search_term, case=False, na=False) |
-                                    filtered_contacts['school_name'].str.contains(search_term, case=False, na=False) |
-                                    filtered_contacts['club_name'].str.contains(search_term, case=False, na=False) |
-                                    filtered_contacts['team_name'].str.contains(search_term, case=False, na=False)
-                                )
+                                search_mask = lta_contact_search_mask(filtered_contacts, lta_filter_key, search_term)
                                 filtered_contacts = filtered_contacts[search_mask]
                             
                             # Display contacts in a table
@@ -1106,7 +1433,7 @@ class LinkedInDashboard:
                             # Export functionality
                             if st.button("Export Filtered Contacts to CSV", key="lta_export_contacts"):
                                 # Use the display_df for export to ensure consistent data
-                                csv = display_df.to_csv(index=False)
+                                csv = csv_buffer(display_df)
                                 st.download_button(
                                     label="Download CSV",
                                     data=csv,
@@ -1118,9 +1445,12 @@ class LinkedInDashboard:
                         with lta_tab2:
                             st.subheader("School/Club Distribution")
                             
+                            # The contact search above narrows filtered_contacts too
+                            counts_key = lta_filter_key + (search_term,)
+                            
                             # Create distribution chart based on filter type
                             if filter_type == "School" or filter_type == "All":
-                                school_counts = filtered_contacts['school_name'].value_counts().reset_index()
+                                school_counts = lta_value_counts(filtered_contacts, counts_key, 'school_name')
                                 school_counts.columns = ['school', 'count']
                                 
                                 if not school_counts.empty:
@@ -1136,7 +1466,7 @@ class LinkedInDashboard:
                                     st.info("No school data available with current filters")
                             
                             if filter_type == "Club" or filter_type == "All":
-                                club_counts = filtered_contacts['club_name'].value_counts().reset_index()
+                                club_counts = lta_value_counts(filtered_contacts, counts_key, 'club_name')
                                 club_counts.columns = ['club', 'count']
                                 
                                 if not club_counts.empty:
@@ -1152,7 +1482,7 @@ class LinkedInDashboard:
                                     st.info("No club data available with current filters")
                             
                             # Location distribution
-                            location_counts = filtered_contacts['location'].value_counts().head(10).reset_index()
+                            location_counts = lta_value_counts(filtered_contacts, counts_key, 'location', top_n=10)
                             location_counts.columns = ['location', 'count']
                             
                             if not location_counts.empty:
@@ -1167,17 +1497,19 @@ class LinkedInDashboard:
                         with lta_tab3:
                             st.subheader("Team Information")
                             
-                            # Get unique teams from filtered contacts
-                            team_ids = filtered_contacts['team_id'].unique()
-                            teams_data = lta_dashboard.teams_df[lta_dashboard.teams_df['team_id'].isin(team_ids)]
+                            # Get unique teams from filtered contacts, sorted for isin_sorted
+                            team_ids = np.sort(filtered_contacts['team_id'].dropna().unique())
+                            teams_data = lta_dashboard.teams_df[
+                                isin_sorted(lta_dashboard.teams_df['team_id'].to_numpy(), team_ids)
+                            ]
                             
                             # Search functionality for teams
                             team_search = st.text_input("Search teams (name, school, club)", key="lta_team_search")
                             if team_search:
-                                search_mask = (
-                                    teams_data['team_name'].str.contains(team_search, case=False, na=False) |
-                                    teams_data['school_name'].str.contains(team_search, case=False, na=False)
-                                )
+                                search_mask = np.logical_or.reduce([
+                                    teams_data[col].str.contains(team_search, case=False, regex=False, na=False).to_numpy(dtype=bool)
+                                    for col in ['team_name', 'school_name']
+                                ])
                                 teams_data = teams_data[search_mask]
                             
                             # Display teams in a table
@@ -1215,20 +1547,19 @@ class LinkedInDashboard:
                         with lta_tab4:
                             st.subheader("Match Schedule")
                             
-                            # Get matches related to filtered teams
-                            team_ids = filtered_contacts['team_id'].unique()
+                            # Get matches related to the filtered teams found above
                             matches_data = lta_dashboard.matches_df[
-                                (lta_dashboard.matches_df['home_team_id'].isin(team_ids)) | 
-                                (lta_dashboard.matches_df['away_team_id'].isin(team_ids))
+                                isin_sorted(lta_dashboard.matches_df['home_team_id'].to_numpy(), team_ids) |
+                                isin_sorted(lta_dashboard.matches_df['away_team_id'].to_numpy(), team_ids)
                             ]
                             
                             # Search functionality for matches
                             match_search = st.text_input("Search matches (team names)", key="lta_match_search")
                             if match_search:
-                                search_mask = (
-                                    matches_data['home_team_name'].str.contains(match_search, case=False, na=False) |
-                                    matches_data['away_team_name'].str.contains(match_search, case=False, na=False)
-                                )
+                                search_mask = np.logical_or.reduce([
+                                    matches_data[col].str.contains(match_search, case=False, regex=False, na=False).to_numpy(dtype=bool)
+                                    for col in ['home_team_name', 'away_team_name']
+                                ])
                                 matches_data = matches_data[search_mask]
                             
                             # Display matches in a table
@@ -1254,7 +1585,10 @@ class LinkedInDashboard:
                             
                             # Export functionality
                             if st.button("Export Filtered Matches to CSV", key="lta_export_matches"):
-                                csv = matches_data[match_display_cols].to_csv(index=False)
+                                csv = lta_csv_bytes(
+                                    matches_data[match_display_cols],
+                                    lta_filter_key + (search_term, match_search, 'matches')
+                                )
                                 st.download_button(
                                     label="Download CSV",
                                     data=csv,
@@ -1275,19 +1609,24 @@ class LinkedInDashboard:
                            'mutual_connections', 'profile_url', 'about']
             
             # Search functionality
-            search_term = st.text_input("Search profiles (name, title, company, or about)")
-            if search_term:
-                search_mask = (
-                    filtered_df['name'].str.contains(search_term, case=False, na=False) |
-                    filtered_df['title'].str.contains(search_term, case=False, na=False) |
-                    filtered_df['company'].str.contains(search_term, case=False, na=False) |
-                    filtered_df['about'].str.contains(search_term, case=False, na=False)
-                )
+            search_term = st.text_input(
+                "Search profiles (name, title, company, or about)",
+                help=f"Type at least {MIN_SEARCH_CHARS} characters"
+            )
+            if len(search_term) >= MIN_SEARCH_CHARS:
+                search_mask = profile_search_mask(filtered_df, profile_filter_key, search_term)
                 filtered_df = filtered_df[search_mask]
             
+            # Only the current page is serialized and sent to the browser
+            page_count = max(1, (len(filtered_df) + PROFILE_PAGE_SIZE - 1) // PROFILE_PAGE_SIZE)
+            page = st.number_input("Page", min_value=1, max_value=page_count, value=1, key="profile_page")
+            start = (page - 1) * PROFILE_PAGE_SIZE
+            page_df = filtered_df.iloc[start:start + PROFILE_PAGE_SIZE]
+            st.caption(f"Showing {start + 1 if len(page_df) else 0}-{start + len(page_df)} of {len(filtered_df)} profiles")
+            
             # Data table with updated column configuration
             st.dataframe(
-                filtered_df[display_cols],
+                page_df[display_cols],
                 use_container_width=True,
                 hide_index=True,
                 column_config={
@@ -1299,7 +1638,7 @@ class LinkedInDashboard:
             
             # Export functionality
             if st.button("Export Filtered Data to CSV"):
-                csv = filtered_df.to_csv(index=False)
+                csv = csv_buffer(filtered_df.drop(columns=['_person_blob', '_search_blob']))
                 st.download_button(
                     label="Download CSV",
                     data=csv,
@@ -1307,38 +1646,6 @@ class LinkedInDashboard:
                     mime="text/csv"
                 )
                 
-            # Email search section
-            def email_search_section():
-                st.subheader("Email Search")
-                
-                # Get selected person's data
-                selected_person = st.selectbox(
-                    "Select Person",
-                    filtered_df,  # Replace with your actual data source
-                    format_func=lambda x: f"{x['name']} - {x['title']} at {x['company']}"  # Adjust based on your data structure
-                )
-                
-                if st.button("Search Email"):
-                    with st.spinner("Searching for email..."):
-                        jina_client = JinaDeepResearch()
-                        result = jina_client.search_email({
-                            'full_name': selected_person['name'],
-                            'company': selected_person['company'],
-                            'title': selected_person['title'],
-                            'linkedin_url': selected_person['profile_url']
-                        })
-                        
-                        if result['email']:
-                            st.success(f"Found email: {result['email']}")
-                            st.info(f"Confidence: {result['confidence']}")
-                            if result['source']:
-                                st.info(f"Source: {result['source']}")
-                        else:
-                            st.warning("No email found")
-                        
-                        with st.expander("Raw Response"):
-                            st.text(result['raw_response'])
-
         except Exception as e:
             st.error(f"Error loading data: {str(e)}")
             st.error("Please make sure the database exists and contains the required tables.")
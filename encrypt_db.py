@@ -1,34 +1,84 @@
 from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 import base64
 import os
 
+# Encrypted files start with MAGIC, a random nonce prefix and the chunk size,
+# followed by one AES-GCM block (ciphertext + 16 byte tag) per plaintext chunk.
+MAGIC = b"SDBGCM01"
+CHUNK_SIZE = 1 << 20
+NONCE_PREFIX_SIZE = 8
+TAG_SIZE = 16
+# Associated data of the last block, so a truncated file fails to decrypt
+FINAL_BLOCK = b"final"
+
 def generate_key():
     """Generate a compatible Fernet key"""
     return Fernet.generate_key()
 
+def _block_nonce(prefix, index):
+    """Build the 12 byte nonce of a block from the file prefix and block index"""
+    return prefix + index.to_bytes(4, 'big')
+
 def encrypt_database(input_db_path="linkedin_data.db", output_db_path="linkedin_data.encrypted.db"):
-    """Encrypt the database file"""
-    # Generate key
+    """Encrypt the database file in fixed-size chunks"""
+    # Generate key; the 32 random bytes of a Fernet key are used as the AES-256 key
     key = generate_key()
-    fernet = Fernet(key)
-    
-    # Read and encrypt database
-    with open(input_db_path, 'rb') as file:
-        file_data = file.read()
-    encrypted_data = fernet.encrypt(file_data)
-    
-    # Save encrypted database
-    with open(output_db_path, 'wb') as file:
-        file.write(encrypted_data)
-    
+    aesgcm = AESGCM(base64.urlsafe_b64decode(key))
+    prefix = os.urandom(NONCE_PREFIX_SIZE)
+
+    # Read and encrypt database one chunk at a time
+    with open(input_db_path, 'rb') as fin, open(output_db_path, 'wb') as fout:
+        fout.write(MAGIC + prefix + CHUNK_SIZE.to_bytes(4, 'big'))
+
+        index = 0
+        chunk = fin.read(CHUNK_SIZE)
+        while True:
+            next_chunk = fin.read(CHUNK_SIZE)
+            aad = FINAL_BLOCK if not next_chunk else b""
+            fout.write(aesgcm.encrypt(_block_nonce(prefix, index), chunk, aad))
+            if not next_chunk:
+                break
+            chunk = next_chunk
+            index += 1
+
     # Save key to secrets.toml
     os.makedirs('.streamlit', exist_ok=True)
     with open('.streamlit/secrets.toml', 'w') as f:
         f.write(f'db_key = "{key.decode()}"')
-        
+
     print(f"Encryption key saved to .streamlit/secrets.toml")
     print(f"Key value: {key.decode()}")
     return key
 
+def decrypt_database_file(key, encrypted_db_path, output_file):
+    """Decrypt an encrypted database into the open binary file output_file.
+
+    Databases encrypted before the chunked format are a single Fernet token
+    and are still accepted.
+    """
+    header_size = len(MAGIC) + NONCE_PREFIX_SIZE + 4
+    with open(encrypted_db_path, 'rb') as fin:
+        header = fin.read(header_size)
+        if not header.startswith(MAGIC):
+            fin.seek(0)
+            output_file.write(Fernet(key).decrypt(fin.read()))
+            return
+
+        aesgcm = AESGCM(base64.urlsafe_b64decode(key))
+        prefix = header[len(MAGIC):len(MAGIC) + NONCE_PREFIX_SIZE]
+        block_size = int.from_bytes(header[-4:], 'big') + TAG_SIZE
+
+        index = 0
+        block = fin.read(block_size)
+        while True:
+            next_block = fin.read(block_size)
+            aad = FINAL_BLOCK if not next_block else b""
+            output_file.write(aesgcm.decrypt(_block_nonce(prefix, index), block, aad))
+            if not next_block:
+                break
+            block = next_block
+            index += 1
+
 if __name__ == "__main__":
-    encrypt_database() 
\ No newline at end of file
+    encrypt_database()
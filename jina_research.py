@@ -1,21 +1,104 @@
 import os
-import requests
 import json
-from typing import Dict, Optional, Union
-from dotenv import load_dotenv
-import streamlit as st
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 import re
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+
+# google-re2 (optional) matches in linear time without backtracking
+try:
+    import re2
+except ImportError:
+    re2 = re
+
+# Patterns used to parse DeepSearch responses, compiled once at import
+# Email, confidence and source fields are picked up in a single scan. The
+# pattern avoids lookarounds so it compiles under both re2 and re.
+_PARSE_RE = re2.compile(
+    r'(?P<email>[\w\.-]+@[\w\.-]+\.\w+)'
+    r'|(?i:confidence:\s*(?P<conf>high|medium|low))'
+    r'|(?i:(?P<conf_phrase>high|medium) confidence)'
+    r'|(?i:source:\s*)(?P<src>[^\n]+)'
+)
+_THINK_RE = re.compile(r'<think>(.*?)</think>', re.DOTALL)
+_STEP_RE = re.compile(r'\d+\.\s*(.*?)(?=\d+\.|$)', re.DOTALL)
+_JSON_FENCE_RE = re.compile(r'```(?:json)?\s*(.*?)```', re.DOTALL)
+_JSON_DECODER = json.JSONDecoder()
+
+def _iter_fields(text):
+    """Yield (field, value) for each email, confidence and source in `text`, in order.
+
+    A source match consumes the rest of its line, so the fields written on
+    that line are yielded from a rescan of the captured value.
+    """
+    for match in _PARSE_RE.finditer(text):
+        field = match.lastgroup
+        yield field, match.group(field)
+        if field == 'src':
+            yield from _iter_fields(match.group(field))
+
+def _find_json_array(text):
+    """Return the first JSON array of objects in `text`, or None.
+
+    Fenced ```json blocks are tried first; otherwise decoding is attempted at
+    each `[` so footnotes and markdown links around the array are skipped.
+    """
+    for candidate in _JSON_FENCE_RE.findall(text) + [text]:
+        start = candidate.find('[')
+        while start != -1:
+            try:
+                value, _ = _JSON_DECODER.raw_decode(candidate, start)
+            except json.JSONDecodeError:
+                value = None
+            if isinstance(value, list) and value and all(isinstance(item, dict) for item in value):
+                return value
+            start = candidate.find('[', start + 1)
+    return None
 
 class JinaDeepResearch:
     """Client for interacting with Jina DeepResearch API"""
     
+    # (connect, read) timeouts in seconds; deep research answers can take minutes
+    timeout = (5, 300)
+    
     def __init__(self):
+        # requests and streamlit are imported here so importing this module stays cheap
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        import streamlit as st
+        
+        self._requests = requests
+        
         # Get API key from Streamlit secrets instead of env
         if 'JINA_API_KEY' not in st.secrets:
             raise ValueError("JINA_API_KEY not found in Streamlit secrets")
             
         self.jina_api_key = st.secrets['JINA_API_KEY']
         self.base_url = "https://deepsearch.jina.ai/v1/chat/completions"
+        self._headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.jina_api_key}"
+        }
+        
+        # One pooled session keeps connections to the API alive between queries.
+        # Read errors and gateway errors are not retried: the POST may already
+        # have been processed. Only refused (429/503) requests are sent again.
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=3,
+                read=False,
+                backoff_factor=0.3,
+                status_forcelist=[429, 503],
+                allowed_methods=frozenset(["POST"])
+            )
+        ))
+    
+    def close(self):
+        """Close the pooled HTTP connections"""
+        self._session.close()
     
     def search_email(self, person_info: Dict[str, str]) -> Dict[str, Union[str, None]]:
         """
@@ -75,40 +158,40 @@ class JinaDeepResearch:
             thoughts = []
             
             # Try <think> tags
-            think_matches = re.findall(r'<think>(.*?)</think>', content, re.DOTALL)
+            think_matches = _THINK_RE.findall(content)
             if think_matches:
                 thoughts.extend(think_matches)
             
             # Try numbered reasoning or steps
-            step_matches = re.findall(r'\d+\.\s*(.*?)(?=\d+\.|$)', content, re.DOTALL)
+            step_matches = _STEP_RE.findall(content)
             if step_matches:
                 thoughts.extend(step_matches)
             
             if thoughts:
                 result['thoughts'] = '\n'.join(t.strip() for t in thoughts)
             
-            # Extract email
-            if '@' in content:
-                email_match = re.search(r'[\w\.-]+@[\w\.-]+\.\w+', content)
-                if email_match:
-                    result['email'] = email_match.group(0)
+            # Extract email, confidence and source, keeping the first of each
+            confidence = None
+            confidence_phrases = set()
+            for field, value in _iter_fields(content):
+                if field == 'email':
+                    if result['email'] is None:
+                        result['email'] = value
+                elif field == 'conf':
+                    if confidence is None:
+                        confidence = value.lower()
+                elif field == 'conf_phrase':
+                    confidence_phrases.add(value.lower())
+                elif result['source'] is None:
+                    result['source'] = value.strip()
             
-            # Extract confidence
-            if 'confidence:' in content.lower():
-                confidence_match = re.search(r'confidence:\s*(high|medium|low)', content, re.I)
-                if confidence_match:
-                    result['confidence'] = confidence_match.group(1).lower()
-            elif 'high confidence' in content.lower():
+            if confidence is not None:
+                result['confidence'] = confidence
+            elif 'high' in confidence_phrases:
                 result['confidence'] = 'high'
-            elif 'medium confidence' in content.lower():
+            elif 'medium' in confidence_phrases:
                 result['confidence'] = 'medium'
             
-            # Extract source
-            if 'source:' in content.lower():
-                source_match = re.search(r'source:\s*(.+?)(?:\n|$)', content, re.I)
-                if source_match:
-                    result['source'] = source_match.group(1).strip()
-            
             return result
             
         except (KeyError, IndexError) as e:
@@ -121,6 +204,117 @@ class JinaDeepResearch:
                 'raw_response': str(response)
             }
 
+    def search_email_batch(self, profiles: List[Dict[str, str]]) -> List[Dict[str, Union[str, None]]]:
+        """
+        Search for email addresses of several people with a single API request
+        
+        Args:
+            profiles: List of person detail dictionaries, each with the same
+                keys as the person_info argument of search_email
+                
+        Returns:
+            List of result dictionaries in the same order as profiles, each
+            with the same keys as the search_email result
+            
+        Raises:
+            ValueError: If no JSON array of results can be found in the response
+        """
+        people = "\n\n".join(
+            f"""        Person {idx}:
+        full_name: {person_info.get('full_name') or ''}
+        Current Company: {person_info.get('company') or ''}
+        Current Title: {person_info.get('title') or ''}
+        LinkedIn Profile: {person_info.get('linkedin_url') or ''}"""
+            for idx, person_info in enumerate(profiles, start=1)
+        )
+        
+        query = f"""Find the current work email address for each of these people:
+{people}
+
+        Instructions:
+        1. Search for each person's most current work email address
+        2. Focus on official company sources, press releases, or verified business listings
+        3. Check for email patterns used at their current company
+        4. Verify any found email against company domain records
+        5. Assess confidence level (high/medium/low) based on source reliability
+        6. Include source of information and your reasoning process
+
+        Please format response with:
+        <think>Your step-by-step reasoning process</think>
+        followed by a JSON array with one object per person, in the order given above, where "person" is the Person number:
+        [{{"person": 1, "full_name": "...", "email": "found_email or null", "confidence": "high/medium/low", "source": "where the email was found", "thoughts": "short reasoning"}}]
+        """
+        
+        response = self.query(query)
+        
+        try:
+            content = response['choices'][0]['message']['content']
+        except (KeyError, IndexError) as e:
+            raise ValueError(f"Unexpected DeepSearch response format: {e!r}") from e
+        
+        # Find the JSON array after any <think> section
+        entries = _find_json_array(_THINK_RE.sub('', content))
+        if entries is None:
+            raise ValueError("No JSON array of results found in the DeepSearch response")
+        
+        # Match entries back to the requested people by their Person number,
+        # falling back to the entry's position in the array
+        entries_by_person = {}
+        for position, entry in enumerate(entries, start=1):
+            try:
+                number = int(entry.get('person', position))
+            except (TypeError, ValueError):
+                number = position
+            entries_by_person.setdefault(number, entry)
+        
+        results = []
+        for number in range(1, len(profiles) + 1):
+            entry = entries_by_person.get(number, {})
+            confidence = str(entry.get('confidence') or 'low').lower()
+            results.append({
+                'email': entry.get('email') or None,
+                'confidence': confidence if confidence in ('high', 'medium', 'low') else 'low',
+                'source': entry.get('source') or None,
+                'thoughts': entry.get('thoughts') or None,
+                'raw_response': content
+            })
+        
+        return results
+
+    def search_email_many(self, profiles: List[Dict[str, str]], batch_size: int = 5,
+                          max_workers: int = 4) -> Iterator[Tuple[range, Future]]:
+        """
+        Search for email addresses of many people with concurrent batch requests
+        
+        Args:
+            profiles: List of person detail dictionaries, each with the same
+                keys as the person_info argument of search_email
+            batch_size: Number of people sent in each search_email_batch request
+            max_workers: Maximum number of requests in flight at once
+            
+        Yields:
+            (indices, future) pairs in the order the requests complete, where
+            indices is the range of profiles covered by the request and
+            future.result() returns their search_email_batch results
+        """
+        batches = [
+            range(start, min(start + batch_size, len(profiles)))
+            for start in range(0, len(profiles), batch_size)
+        ]
+        
+        # Shut down without waiting, so a consumer that stops early (e.g. a
+        # Streamlit rerun) is not blocked until every queued request finishes
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            futures = {
+                executor.submit(self.search_email_batch, [profiles[i] for i in indices]): indices
+                for indices in batches
+            }
+            for future in as_completed(futures):
+                yield futures[future], future
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
     def query(self, question: str, max_budget: int = 1000000, max_bad_attempts: int = 3) -> Dict:
         """
         Send a query to Jina DeepResearch
@@ -133,11 +327,6 @@ class JinaDeepResearch:
         Returns:
             Dict containing the response data
         """
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self.jina_api_key}"
-        }
-        
         data = {
             "model": "jina-deepsearch-v1",
             "messages": [
@@ -153,15 +342,16 @@ class JinaDeepResearch:
         }
         
         try:
-            response = requests.post(
+            response = self._session.post(
                 self.base_url,
-                headers=headers,
-                json=data
+                headers=self._headers,
+                json=data,
+                timeout=self.timeout
             )
             response.raise_for_status()
             return response.json()
             
-        except requests.exceptions.RequestException as e:
+        except self._requests.exceptions.RequestException as e:
             print(f"Error making request: {e}")
             raise
 
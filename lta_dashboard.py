@@ -1,11 +1,181 @@
 import streamlit as st
 import sqlite3
 import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import io
 import plotly.express as px
 from pathlib import Path
-from cryptography.fernet import Fernet
 import tempfile
 import os
+import atexit
+import time
+from contextlib import contextmanager
+from encrypt_db import decrypt_database_file
+
+# Set PERF_PROFILE=1 to show load, filter and search timings in the sidebar
+PERF_PROFILE = os.environ.get('PERF_PROFILE', '') not in ('', '0')
+
+# Number of schools or clubs shown in the distribution charts
+TOP_DISTRIBUTION = 30
+
+# Text columns given a lower-cased search copy named _<column>_lc at load time
+LOWERCASE_SEARCH_COLS = {
+    'contacts': ['name', 'email', 'team_name'],
+    'teams': ['team_name'],
+    'matches': ['home_team_name', 'away_team_name']
+}
+
+# RAM-backed directory for the decrypted database, so it is never written to disk
+SHM_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+# Indexes for the contacts join, created on the decrypted copy of the database
+LTA_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_team_contacts_contact ON team_contacts(contact_id)",
+    "CREATE INDEX IF NOT EXISTS idx_teams_team ON teams(team_id, tournament_id)",
+    "CREATE INDEX IF NOT EXISTS idx_clubs_club ON clubs(club_id, tournament_id)"
+]
+
+@contextmanager
+def perf_timer(timings, label):
+    """Record the wall time of the enclosed block in `timings`, in milliseconds."""
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        timings[label] = (time.perf_counter_ns() - start) / 1e6
+
+def arrow_view(df, columns):
+    """Convert only `columns` of a DataFrame to an Arrow table for st.dataframe.
+
+    Streamlit sends Arrow tables as they are, skipping the pandas column copy
+    and its own pandas-to-Arrow conversion. Frames with columns Arrow cannot
+    type are returned as a pandas column selection instead.
+    """
+    try:
+        return pa.Table.from_pandas(df, columns=columns, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return df[columns]
+
+def csv_buffer(df, chunksize=10_000):
+    """Write a DataFrame as CSV into an in-memory file for download.
+
+    Uses the pyarrow CSV writer; columns Arrow cannot type (mixed Python
+    objects) fall back to pandas, writing `chunksize` rows at a time.
+    """
+    buffer = io.BytesIO()
+    try:
+        pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), buffer)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        buffer = io.BytesIO()
+        df.to_csv(buffer, index=False, chunksize=chunksize)
+    buffer.seek(0)
+    return buffer
+
+@st.cache_resource(show_spinner=False)
+def decrypt_lta_database(db_path, db_mtime):
+    """Decrypt the LTA database once per version and return the temporary path.
+
+    `db_mtime` is only part of the cache key. The decrypted file is kept for
+    the lifetime of the process and removed at exit.
+    """
+    dashboard = LTADashboard(db_path)
+    dashboard.decrypt_database()
+    atexit.register(dashboard.cleanup)
+    return dashboard.temp_db_path
+
+@st.cache_resource(show_spinner=False)
+def _load_all(db_path, db_mtime):
+    """Load the LTA tables and filter options once per database version.
+
+    Returns (clubs_df, teams_df, contacts_df, matches_df, club_names,
+    school_names, locations, roles, genders, team_code_count). The frames
+    are shared across reruns and must not be modified in place.
+    """
+    dashboard = LTADashboard(db_path)
+    dashboard.temp_db_path = decrypt_lta_database(db_path, db_mtime)
+    dashboard.load_data()
+    return (
+        dashboard.clubs_df, dashboard.teams_df, dashboard.contacts_df, dashboard.matches_df,
+        dashboard.club_names, dashboard.school_names, dashboard.locations,
+        dashboard.roles, dashboard.genders, dashboard.team_code_count
+    )
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _filter_positions(db_path, db_mtime, filter_type, schools, clubs, locations, roles, genders):
+    """Return the row positions of the contacts matching the sidebar filters.
+
+    Only the positions are cached, which keeps the cache entries small.
+    """
+    contacts_df = _load_all(db_path, db_mtime)[2]
+    
+    # Combine the filters into one mask
+    mask = np.ones(len(contacts_df), dtype=bool)
+    
+    if filter_type == "School" and schools:
+        mask &= contacts_df['school_name'].isin(schools).to_numpy()
+    elif filter_type == "Club" and clubs:
+        mask &= contacts_df['club_name'].isin(clubs).to_numpy()
+    
+    for col, selected in (
+        ('location', locations),
+        ('role', roles),
+        ('gender', genders)
+    ):
+        if selected:
+            mask &= contacts_df[col].isin(selected).to_numpy()
+    
+    return np.flatnonzero(mask)
+
+def search_mask(df, search_term, text_cols, categorical_cols=()):
+    """Mark rows where any of `text_cols` or `categorical_cols` contains `search_term`.
+
+    Matching is literal and case-insensitive. Text columns are matched through
+    their lower-cased _<column>_lc copies; categorical columns are matched once
+    per category.
+    """
+    term = search_term.lower()
+    masks = [
+        df[f'_{col}_lc'].str.contains(term, regex=False, na=False).to_numpy(dtype=bool)
+        for col in text_cols
+    ]
+    masks += [
+        df[col].str.contains(term, case=False, regex=False, na=False).to_numpy(dtype=bool)
+        for col in categorical_cols
+    ]
+    return np.logical_or.reduce(masks)
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _contact_search_mask(_contacts_df, filter_key, search_term):
+    """Mark contacts whose name, email, school, club or team contains `search_term`.
+
+    `_contacts_df` is not hashed by Streamlit; `filter_key` must uniquely
+    identify the frame passed in.
+    """
+    return search_mask(
+        _contacts_df, search_term,
+        LOWERCASE_SEARCH_COLS['contacts'], ['school_name', 'club_name']
+    )
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _value_counts(_contacts_df, filter_key, column, top_n):
+    """Count contacts per category of `column`, keeping the `top_n` most frequent.
+
+    `_contacts_df` is not hashed by Streamlit; `filter_key` must uniquely
+    identify the frame passed in.
+    """
+    counts = _contacts_df[column].cat.remove_unused_categories().value_counts()
+    return counts.head(top_n).rename_axis(column).reset_index(name='count')
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _first_contact_positions(_contacts_df, filter_key):
+    """Return the positions of the first row of each contact in `_contacts_df`.
+
+    `_contacts_df` is not hashed by Streamlit; `filter_key` must uniquely
+    identify the frame passed in.
+    """
+    return np.flatnonzero(~_contacts_df['contact_id'].duplicated().to_numpy())
 
 class LTADashboard:
     def __init__(self, encrypted_db_path="lta_data.encrypted.db"):
@@ -21,27 +191,34 @@ class LTADashboard:
                 raise Exception("LTA database key not found in secrets")
             
             key = st.secrets['lta_db_key'].encode()
-            fernet = Fernet(key)
-            
-            # Read encrypted database
-            with open(self.db_path, 'rb') as file:
-                encrypted_data = file.read()
-            
-            # Decrypt data
-            decrypted_data = fernet.decrypt(encrypted_data)
-            
-            # Create temporary file
-            temp_file = tempfile.NamedTemporaryFile(delete=False)
-            self.temp_db_path = temp_file.name
             
-            # Write decrypted data to temporary file
-            with open(self.temp_db_path, 'wb') as file:
-                file.write(decrypted_data)
+            try:
+                self._decrypt_to_temp_file(key, SHM_DIR)
+            except OSError:
+                if SHM_DIR is None:
+                    raise
+                # /dev/shm is too small for the database; fall back to the disk temp dir
+                self._decrypt_to_temp_file(key, None)
                 
         except Exception as e:
             st.error(f"Error decrypting LTA database: {str(e)}")
             raise
     
+    def _decrypt_to_temp_file(self, key, temp_dir):
+        """Decrypt the database chunk by chunk into a new temporary file in temp_dir.
+
+        The file is removed again if decryption fails for any reason, so a
+        wrong key or a full /dev/shm does not leave a partial copy behind.
+        """
+        temp_file = tempfile.NamedTemporaryFile(delete=False, dir=temp_dir)
+        try:
+            with temp_file:
+                decrypt_database_file(key, self.db_path, temp_file)
+        except BaseException:
+            os.unlink(temp_file.name)
+            raise
+        self.temp_db_path = temp_file.name
+    
     def get_connection(self):
         """Create and return a database connection."""
         if not self.temp_db_path:
@@ -53,26 +230,41 @@ class LTADashboard:
         if self.temp_db_path and os.path.exists(self.temp_db_path):
             os.unlink(self.temp_db_path)
     
+    def create_indexes(self, conn):
+        """Index the join keys of the contacts query if they are not indexed yet."""
+        for statement in LTA_INDEXES:
+            conn.execute(statement)
+        conn.commit()
+    
     def load_data(self):
-        """Load data from database into DataFrames."""
+        """Load data from database into DataFrames.
+        
+        Only the columns the dashboard shows or filters on are selected.
+        """
         conn = self.get_connection()
         
         try:
+            self.create_indexes(conn)
+            
             # Load clubs data
             self.clubs_df = pd.read_sql_query("""
-                SELECT * FROM clubs
-            """, conn)
+                SELECT club_name, location FROM clubs
+            """, conn).astype('category')
             
             # Load teams data
             self.teams_df = pd.read_sql_query("""
-                SELECT * FROM teams
+                SELECT team_id, team_name, school_name, gender, draw_name, url
+                FROM teams
             """, conn)
+            self.teams_df = self.teams_df.astype(
+                {col: 'category' for col in ['school_name', 'gender', 'draw_name']}
+            )
             
             # Load contacts data with team and club information
             self.contacts_df = pd.read_sql_query("""
                 SELECT 
                     c.contact_id, c.name, c.phone, c.email,
-                    tc.role, tc.team_id, tc.tournament_id,
+                    tc.role, tc.team_id,
                     t.team_name, t.school_name, t.gender,
                     cl.club_name, cl.location
                 FROM contacts c
@@ -81,20 +273,66 @@ class LTADashboard:
                 LEFT JOIN clubs cl ON t.club_id = cl.club_id AND t.tournament_id = cl.tournament_id
             """, conn)
             
+            # Arrow-backed strings for the free text; low-cardinality columns are
+            # stored once per category, and string methods on them only scan the
+            # categories
+            self.contacts_df = self.contacts_df.astype({
+                'name': 'string[pyarrow]',
+                'email': 'string[pyarrow]',
+                'team_name': 'string[pyarrow]',
+                'school_name': 'category',
+                'club_name': 'category',
+                'role': 'category',
+                'gender': 'category',
+                'location': 'category'
+            })
+            
             # Load matches data
             self.matches_df = pd.read_sql_query("""
-                SELECT * FROM matches
+                SELECT
+                    home_team_id, away_team_id,
+                    match_date, match_time, home_team_name, away_team_name,
+                    score, status, url
+                FROM matches
             """, conn)
             
-            # Get unique values for filters
-            self.club_names = sorted(self.clubs_df['club_name'].dropna().unique())
-            self.school_names = sorted(self.teams_df['school_name'].dropna().unique())
-            self.locations = sorted(pd.concat([
-                self.clubs_df['location'].dropna(),
-                self.contacts_df['location'].dropna()
-            ]).unique())
-            self.roles = sorted(self.contacts_df['role'].dropna().unique())
-            self.genders = sorted(self.teams_df['gender'].dropna().unique())
+            # Number the team ids shared by teams, contacts and matches, so the team
+            # and match views can select rows by indexing a lookup table
+            team_id_cols = [
+                (self.teams_df, 'team_id', '_team_code'),
+                (self.contacts_df, 'team_id', '_team_code'),
+                (self.matches_df, 'home_team_id', '_home_code'),
+                (self.matches_df, 'away_team_id', '_away_code')
+            ]
+            codes, uniques = pd.factorize(pd.concat(
+                [df[col] for df, col, _ in team_id_cols], ignore_index=True
+            ))
+            start = 0
+            for df, _, code_col in team_id_cols:
+                df[code_col] = codes[start:start + len(df)]
+                start += len(df)
+            self.team_code_count = len(uniques)
+            
+            # Lower-cased copies of the searched text columns, so searches match
+            # literally without lower-casing every row on each query
+            for table, df in (
+                ('contacts', self.contacts_df),
+                ('teams', self.teams_df),
+                ('matches', self.matches_df)
+            ):
+                for col in LOWERCASE_SEARCH_COLS[table]:
+                    df[f'_{col}_lc'] = df[col].astype('string[pyarrow]').str.lower()
+            
+            # Get unique values for filters; categories are already distinct and non-null
+            self.club_names = sorted(self.clubs_df['club_name'].cat.categories)
+            self.school_names = sorted(self.teams_df['school_name'].cat.categories)
+            # Union of the distinct locations of both tables, without concatenating rows
+            self.locations = sorted(
+                set(self.clubs_df['location'].cat.categories) |
+                set(self.contacts_df['location'].cat.categories)
+            )
+            self.roles = sorted(self.contacts_df['role'].cat.categories)
+            self.genders = sorted(self.teams_df['gender'].cat.categories)
             
         finally:
             conn.close()
@@ -112,8 +350,15 @@ class LTADashboard:
             if not os.path.exists(self.db_path):
                 st.error(f"Database file {self.db_path} not found. Please run the lta_db_loader.py script first.")
                 return
-                
-            self.load_data()
+            
+            timings = {}
+            db_mtime = os.path.getmtime(self.db_path)
+            with perf_timer(timings, "Load"):
+                (
+                    self.clubs_df, self.teams_df, self.contacts_df, self.matches_df,
+                    self.club_names, self.school_names, self.locations,
+                    self.roles, self.genders, self.team_code_count
+                ) = _load_all(self.db_path, db_mtime)
             
             # Sidebar filters
             st.sidebar.header("Filters")
@@ -124,6 +369,7 @@ class LTADashboard:
                 ["All", "School", "Club"]
             )
             
+            selected_schools, selected_clubs = [], []
             if filter_type == "School":
                 selected_schools = st.sidebar.multiselect(
                     "Select Schools",
@@ -158,57 +404,67 @@ class LTADashboard:
                 default=[]
             )
             
-            # Apply filters to contacts dataframe
-            filtered_contacts = self.contacts_df.copy()
-            
-            if filter_type == "School" and selected_schools:
-                filtered_contacts = filtered_contacts[filtered_contacts['school_name'].isin(selected_schools)]
-            elif filter_type == "Club" and selected_clubs:
-                filtered_contacts = filtered_contacts[filtered_contacts['club_name'].isin(selected_clubs)]
-            
-            if selected_locations:
-                filtered_contacts = filtered_contacts[filtered_contacts['location'].isin(selected_locations)]
-            
-            if selected_roles:
-                filtered_contacts = filtered_contacts[filtered_contacts['role'].isin(selected_roles)]
-            
-            if selected_genders:
-                filtered_contacts = filtered_contacts[filtered_contacts['gender'].isin(selected_genders)]
+            # Apply filters to contacts dataframe; the matching rows are cached per selection
+            filter_key = (
+                db_mtime, filter_type,
+                tuple(selected_schools), tuple(selected_clubs),
+                tuple(selected_locations), tuple(selected_roles), tuple(selected_genders)
+            )
+            with perf_timer(timings, "Filter"):
+                filtered_contacts = self.contacts_df.take(_filter_positions(self.db_path, *filter_key))
             
             # Display metrics
             col1, col2, col3, col4 = st.columns(4)
             with col1:
                 st.metric("Total Contacts", len(filtered_contacts))
             with col2:
-                st.metric("Schools/Clubs", len(filtered_contacts[['school_name', 'club_name']].drop_duplicates()))
+                st.metric("Schools/Clubs", filtered_contacts.groupby(
+                    ['school_name', 'club_name'], observed=True, dropna=False
+                ).ngroups)
             with col3:
-                st.metric("Teams", len(filtered_contacts['team_id'].unique()))
+                st.metric("Teams", filtered_contacts['team_id'].nunique(dropna=False))
             with col4:
-                st.metric("Locations", len(filtered_contacts['location'].dropna().unique()))
+                st.metric("Locations", filtered_contacts['location'].nunique())
             
-            # Create tabs for different views
-            tab1, tab2, tab3, tab4 = st.tabs([
-                "Contact List", 
-                "School/Club Distribution", 
-                "Team Information",
-                "Match Schedule"
-            ])
+            # Search functionality; applies to every view below
+            search_term = st.text_input("Search contacts (name, email, school, club)", key="contact_search")
+            if search_term:
+                with perf_timer(timings, "Search"):
+                    filtered_contacts = filtered_contacts[
+                        _contact_search_mask(filtered_contacts, filter_key, search_term)
+                    ]
+            
+            if PERF_PROFILE:
+                st.sidebar.subheader("Performance")
+                for label, elapsed_ms in timings.items():
+                    st.sidebar.caption(f"{label}: {elapsed_ms:.1f} ms")
+            
+            # Identifies the searched contacts for the cached aggregations below
+            search_key = filter_key + (search_term,)
+            
+            # Unlike st.tabs, which runs every tab body, only the selected view is computed
+            active_tab = st.radio(
+                "View",
+                [
+                    "Contact List", 
+                    "School/Club Distribution", 
+                    "Team Information",
+                    "Match Schedule"
+                ],
+                horizontal=True,
+                key="active_tab"
+            )
             
-            with tab1:
+            if active_tab in ("Team Information", "Match Schedule"):
+                # Teams of the filtered contacts as a lookup table over the team codes,
+                # shared by both views; code -1 (missing id) reads the last, unset slot
+                team_selected = np.zeros(self.team_code_count + 1, dtype=bool)
+                team_selected[filtered_contacts['_team_code'].to_numpy()] = True
+                team_selected[-1] = False
+            
+            if active_tab == "Contact List":
                 st.subheader("Contact List")
                 
-                # Search functionality
-                search_term = st.text_input("Search contacts (name, email, school, club)", key="contact_search")
-                if search_term:
-                    search_mask = (
-                        filtered_contacts['name'].str.contains(search_term, case=False, na=False) |
-                        filtered_contacts['email'].str.contains(search_term, case=False, na=False) |
-                        filtered_contacts['school_name'].str.contains(search_term, case=False, na=False) |
-                        filtered_contacts['club_name'].str.contains(search_term, case=False, na=False) |
-                        filtered_contacts['team_name'].str.contains(search_term, case=False, na=False)
-                    )
-                    filtered_contacts = filtered_contacts[search_mask]
-                
                 # Display contacts in a table
                 display_cols = [
                     'name', 'email', 'phone', 'role', 
@@ -217,10 +473,12 @@ class LTADashboard:
                 ]
                 
                 # Remove duplicate contacts (same person might be associated with multiple teams)
-                deduplicated_contacts = filtered_contacts.drop_duplicates(subset=['contact_id'])
+                deduplicated_contacts = filtered_contacts.take(
+                    _first_contact_positions(filtered_contacts, search_key)
+                )
                 
                 st.dataframe(
-                    deduplicated_contacts[display_cols],
+                    arrow_view(deduplicated_contacts, display_cols),
                     use_container_width=True,
                     hide_index=True,
                     column_config={
@@ -237,7 +495,7 @@ class LTADashboard:
                 
                 # Export functionality
                 if st.button("Export Filtered Contacts to CSV"):
-                    csv = deduplicated_contacts[display_cols].to_csv(index=False)
+                    csv = csv_buffer(deduplicated_contacts[display_cols])
                     st.download_button(
                         label="Download CSV",
                         data=csv,
@@ -245,12 +503,12 @@ class LTADashboard:
                         mime="text/csv"
                     )
             
-            with tab2:
+            elif active_tab == "School/Club Distribution":
                 st.subheader("School/Club Distribution")
                 
                 # Create distribution chart based on filter type
                 if filter_type == "School" or filter_type == "All":
-                    school_counts = filtered_contacts['school_name'].value_counts().reset_index()
+                    school_counts = _value_counts(filtered_contacts, search_key, 'school_name', TOP_DISTRIBUTION)
                     school_counts.columns = ['school', 'count']
                     
                     if not school_counts.empty:
@@ -258,7 +516,7 @@ class LTADashboard:
                             school_counts,
                             x='school',
                             y='count',
-                            title="Contacts by School",
+                            title=f"Contacts by School (top {TOP_DISTRIBUTION})",
                             labels={'school': 'School', 'count': 'Number of Contacts'}
                         )
                         st.plotly_chart(fig1, use_container_width=True)
@@ -266,7 +524,7 @@ class LTADashboard:
                         st.info("No school data available with current filters")
                 
                 if filter_type == "Club" or filter_type == "All":
-                    club_counts = filtered_contacts['club_name'].value_counts().reset_index()
+                    club_counts = _value_counts(filtered_contacts, search_key, 'club_name', TOP_DISTRIBUTION)
                     club_counts.columns = ['club', 'count']
                     
                     if not club_counts.empty:
@@ -274,7 +532,7 @@ class LTADashboard:
                             club_counts,
                             x='club',
                             y='count',
-                            title="Contacts by Club",
+                            title=f"Contacts by Club (top {TOP_DISTRIBUTION})",
                             labels={'club': 'Club', 'count': 'Number of Contacts'}
                         )
                         st.plotly_chart(fig2, use_container_width=True)
@@ -282,7 +540,7 @@ class LTADashboard:
                         st.info("No club data available with current filters")
                 
                 # Location distribution
-                location_counts = filtered_contacts['location'].value_counts().head(10).reset_index()
+                location_counts = _value_counts(filtered_contacts, search_key, 'location', 10)
                 location_counts.columns = ['location', 'count']
                 
                 if not location_counts.empty:
@@ -294,21 +552,17 @@ class LTADashboard:
                     )
                     st.plotly_chart(fig3, use_container_width=True)
             
-            with tab3:
+            elif active_tab == "Team Information":
                 st.subheader("Team Information")
                 
-                # Get unique teams from filtered contacts
-                team_ids = filtered_contacts['team_id'].unique()
-                teams_data = self.teams_df[self.teams_df['team_id'].isin(team_ids)]
+                teams_data = self.teams_df[team_selected[self.teams_df['_team_code'].to_numpy()]]
                 
                 # Search functionality for teams
                 team_search = st.text_input("Search teams (name, school, club)", key="team_search")
                 if team_search:
-                    search_mask = (
-                        teams_data['team_name'].str.contains(team_search, case=False, na=False) |
-                        teams_data['school_name'].str.contains(team_search, case=False, na=False)
-                    )
-                    teams_data = teams_data[search_mask]
+                    teams_data = teams_data[search_mask(
+                        teams_data, team_search, LOWERCASE_SEARCH_COLS['teams'], ['school_name']
+                    )]
                 
                 # Display teams in a table
                 team_display_cols = [
@@ -317,7 +571,7 @@ class LTADashboard:
                 ]
                 
                 st.dataframe(
-                    teams_data[team_display_cols],
+                    arrow_view(teams_data, team_display_cols),
                     use_container_width=True,
                     hide_index=True,
                     column_config={
@@ -330,7 +584,7 @@ class LTADashboard:
                 )
                 
                 # Team gender distribution
-                gender_counts = teams_data['gender'].value_counts().reset_index()
+                gender_counts = teams_data['gender'].cat.remove_unused_categories().value_counts().reset_index()
                 gender_counts.columns = ['gender', 'count']
                 
                 if not gender_counts.empty:
@@ -342,24 +596,21 @@ class LTADashboard:
                     )
                     st.plotly_chart(fig4, use_container_width=True)
             
-            with tab4:
+            elif active_tab == "Match Schedule":
                 st.subheader("Match Schedule")
                 
-                # Get matches related to filtered teams
-                team_ids = filtered_contacts['team_id'].unique()
+                # Get matches related to the filtered teams
                 matches_data = self.matches_df[
-                    (self.matches_df['home_team_id'].isin(team_ids)) | 
-                    (self.matches_df['away_team_id'].isin(team_ids))
+                    team_selected[self.matches_df['_home_code'].to_numpy()] |
+                    team_selected[self.matches_df['_away_code'].to_numpy()]
                 ]
                 
                 # Search functionality for matches
                 match_search = st.text_input("Search matches (team names)", key="match_search")
                 if match_search:
-                    search_mask = (
-                        matches_data['home_team_name'].str.contains(match_search, case=False, na=False) |
-                        matches_data['away_team_name'].str.contains(match_search, case=False, na=False)
-                    )
-                    matches_data = matches_data[search_mask]
+                    matches_data = matches_data[search_mask(
+                        matches_data, match_search, LOWERCASE_SEARCH_COLS['matches']
+                    )]
                 
                 # Display matches in a table
                 match_display_cols = [
@@ -368,7 +619,7 @@ class LTADashboard:
                 ]
                 
                 st.dataframe(
-                    matches_data[match_display_cols],
+                    arrow_view(matches_data, match_display_cols),
                     use_container_width=True,
                     hide_index=True,
                     column_config={
@@ -384,7 +635,7 @@ class LTADashboard:
                 
                 # Export functionality
                 if st.button("Export Filtered Matches to CSV"):
-                    csv = matches_data[match_display_cols].to_csv(index=False)
+                    csv = csv_buffer(matches_data[match_display_cols])
                     st.download_button(
                         label="Download CSV",
                         data=csv,
@@ -395,8 +646,6 @@ class LTADashboard:
         except Exception as e:
             st.error(f"Error loading data: {str(e)}")
             st.error("Please make sure the database exists and contains the required tables.")
-        finally:
-            self.cleanup()
 
 if __name__ == "__main__":
     dashboard = LTADashboard()